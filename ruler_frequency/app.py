@@ -1,12 +1,7 @@
 import streamlit as st
 import numpy as np
-from scipy.optimize import fsolve
-import matplotlib.pyplot as plt
-from matplotlib.ticker import AutoMinorLocator
 
-# 中文显示设置
-plt.rcParams["font.family"] = ["sans-serif", "Arial Unicode MS", "Heiti TC"]
-plt.rcParams["axes.unicode_minus"] = False
+from core import TWO_PI, calculate_first_frequency, damped, lttb, solve_beta
 
 # 页面配置
 st.set_page_config(
@@ -19,18 +14,61 @@ st.set_page_config(
 st.title("📏 尺子一阶固有频率计算器")
 st.markdown("基于欧拉梁理论，计算矩形截面悬臂梁的一阶固有频率，并绘制**阻尼振动时间曲线**。")
 
-
-# 定义核心函数
-def equation(p, l):
-    """悬臂梁特征方程：1 + cos(p*l) * cosh(p*l) = 0"""
-    return 1 + np.cos(p * l) * np.cosh(p * l)
-
-
-def calculate_first_frequency(p, L, E, I, rho, A):
-    """计算悬臂梁一阶固有频率（无阻尼固有频率ωₙ）"""
-    stiffness_mass_ratio = np.sqrt((E * I) / (rho * A))
-    frequency = (p ** 2) * stiffness_mass_ratio / (2 * np.pi)
-    return frequency
+# 时间网格：每个振动周期取 SAMPLES_PER_CYCLE 个点，总点数限制在 [1000, MAX_GRID_POINTS]；
+# 绘图最多只发送2000个点，上限取20000足以供 LTTB 挑选峰谷，同时限制每个缓存条目的大小
+SAMPLES_PER_CYCLE = 20
+MAX_GRID_POINTS = 20_000
+
+
+def time_grid(duration, n=1000):
+    """均匀时间序列；点数 n 由 fₙ 与 ζ 决定，不再单独缓存，随 _compute 的结果一并缓存"""
+    return np.linspace(0.0, duration, n)
+
+
+def compute(L, b, h, rho, E_GPa, duration, amplitude, zeta):
+    """先把输入量化到控件步长对应的网格，再调用带缓存的计算，避免浮点抖动导致缓存失效"""
+    L = round(L, 6)
+    b = round(b, 6)
+    h = round(h, 7)
+    rho = int(rho)
+    E_GPa = round(E_GPa, 3)
+    duration = round(duration, 2)
+    amplitude = round(amplitude, 5)
+    zeta = round(zeta, 4)
+    return _compute(L, b, h, rho, E_GPa, duration, amplitude, zeta)
+
+
+@st.cache_data(max_entries=64, ttl=3600)
+def _compute(L, b, h, rho, E_GPa, duration, amplitude, zeta):
+    """求解固有频率并生成阻尼振动曲线，输入不变时直接复用缓存结果"""
+    # 单位转换与参数计算
+    E = E_GPa * 10 ** 9  # 转换为Pa
+    I = (b * h ** 3) / 12  # 截面惯性矩
+    A = b * h  # 横截面积
+
+    # 牛顿迭代求解特征方程，得到 p（单位：1/m）
+    p_value, residual = solve_beta(L)
+    error = abs(residual)  # 返回根处的残差
+    f_n = calculate_first_frequency(p_value, L, E, I, rho, A)  # 固有频率（Hz）
+    omega_n = TWO_PI * f_n  # 无阻尼圆频率（rad/s）
+
+    # 阻尼振动参数（根据公式x(t)=A₀e^(-ζωₙt)cos(ω_d t + φ)），阻尼圆频率 ω_d 由 damped 一并给出
+    phi = 0  # 初始相位（设为0，可根据需要调整）
+    # 生成时间序列与位移数据
+    if zeta >= 1:
+        # 临界阻尼或过阻尼时为单调指数衰减：只在衰减窗口 [0, 10τ] 内取50个点（τ=1/(ζωₙ)），
+        # 之后曲线已近似为0，仅补上终点
+        t_decay = min(duration, 10 / (zeta * omega_n))
+        t = time_grid(t_decay, n=50)
+        if t_decay < duration:
+            t = np.append(t, duration)
+    else:
+        cycles = f_n * duration
+        n = min(MAX_GRID_POINTS, max(1000, int(SAMPLES_PER_CYCLE * cycles)))
+        t = time_grid(duration, n=n)
+    displacement, envelope, omega_d = damped(t, amplitude, zeta, omega_n, phi)
+    omega_d = float(omega_d)  # 阻尼圆频率（rad/s）
+    return p_value, error, f_n, omega_n, omega_d, t, displacement, envelope
 
 
 # 输入区域 - 使用两列布局
@@ -93,36 +131,9 @@ with col2:
 # 计算按钮
 if st.button("🔍 计算并绘制振动曲线", type="primary"):
     try:
-        # 单位转换与参数计算
-        E = E_GPa * 10 ** 9  # 转换为Pa
-        I = (b * h ** 3) / 12  # 截面惯性矩
-        A = b * h  # 横截面积
-
-        # 求解特征方程，得到无阻尼固有频率ωₙ（单位：rad/s）
-        initial_guess = 1.875 / L
-        solution, infodict, ier, mesg = fsolve(
-            equation,
-            initial_guess,
-            args=(L,),
-            xtol=1e-12,
-            maxfev=5000,
-            full_output=True
-        )
-        p_value = solution[0]
-        error = abs(equation(p_value, L))
-        f_n = calculate_first_frequency(p_value, L, E, I, rho, A)  # 固有频率（Hz）
-        omega_n = 2 * np.pi * f_n  # 无阻尼圆频率（rad/s）
-
-        # 计算阻尼振动参数（根据公式x(t)=A₀e^(-ζωₙt)cos(ω_d t + φ)）
-        omega_d = omega_n * np.sqrt(1 - zeta ** 2) if zeta < 1 else 0  # 阻尼圆频率
-        phi = 0  # 初始相位（设为0，可根据需要调整）
-        f_nn = omega_d/(2*np.pi)
-        # 生成时间序列与位移数据
-        t = np.linspace(0, duration, 1000)
-        if zeta < 1:  # 欠阻尼状态（有振动）
-            displacement = amplitude * np.exp(-zeta * omega_n * t) * np.cos(omega_d * t + phi)
-        else:  # 临界阻尼或过阻尼（无振动，指数衰减）
-            displacement = amplitude * np.exp(-zeta * omega_n * t)
+        (p_value, error, f_n, omega_n, omega_d,
+         t, displacement, envelope) = compute(L, b, h, rho, E_GPa, duration, amplitude, zeta)
+        f_nn = omega_d / TWO_PI
 
         # 结果展示
         st.success("计算完成！结果如下：")
@@ -135,35 +146,31 @@ if st.button("🔍 计算并绘制振动曲线", type="primary"):
                 st.info(f"**解的误差**：{error:.2e}")
                 st.info(f"**阻尼比**：{zeta:.2f}")
             with result_cols[2]:
-                st.info(f"**求解状态**：{'成功' if ier == 1 else '失败'}")
+                st.info(f"**求解状态**：{'成功' if error < 1e-10 else '失败'}")
                 if zeta < 1:
                     st.info(f"**阻尼修正频率**：{f_nn:.2f} Hz")
 
         # 绘制阻尼振动曲线
         st.subheader("📈 悬臂梁阻尼振动时间曲线")
-        plt.style.use('seaborn-v0_8-whitegrid')
-        fig, ax = plt.subplots(figsize=(10, 4))
+        st.caption(f'Free vibration curve (f = {f_nn:.2f} Hz), displacement (m)')
 
-        # 绘制振动曲线
-        ax.plot(t, displacement, color='#1E88E5', linewidth=2.5,
-                label=f'ζ={zeta:.2f}, fₙ={f_nn:.2f} Hz')
+        # 振动曲线（浏览器端渲染，不在服务端生成图片）；用 LTTB 降采样后再发送到前端，
+        # 按每个周期约4个点取样，点数限制在 [200, 2000]
+        n_plot = min(2000, max(200, int(4 * f_n * duration)))
+        keep = lttb(t, displacement, n_plot)
+        t, displacement, envelope = t[keep], displacement[keep], envelope[keep]
+        curves = {'Time (s)': t, f'ζ={zeta:.2f}, fₙ={f_nn:.2f} Hz': displacement}
+        colors = {f'ζ={zeta:.2f}, fₙ={f_nn:.2f} Hz': '#1E88E5'}
 
         # 若有阻尼，添加包络线（可视化衰减趋势）
         if zeta > 0 and zeta < 1:
-            envelope = amplitude * np.exp(-zeta * omega_n * t)
-            ax.plot(t, envelope, 'r--', alpha=0.5, linewidth=1.5, label='衰减包络线')
-            ax.plot(t, -envelope, 'r--', alpha=0.5, linewidth=1.5)
-
-        # 图表美化
-        ax.set_title(f'Free vibration curve (f = {f_nn:.2f} Hz)', fontsize=14)
-        ax.set_xlabel('Time (s)', fontsize=12)
-        ax.set_ylabel('Displacement (m)', fontsize=12)
-        ax.set_xlim(0, duration)
-        ax.xaxis.set_minor_locator(AutoMinorLocator())
-        ax.yaxis.set_minor_locator(AutoMinorLocator())
-        ax.grid(which='minor', linestyle='--', alpha=0.3)
-
-        st.pyplot(fig)
+            curves['衰减包络线'] = envelope
+            curves['-衰减包络线'] = -envelope
+            colors['衰减包络线'] = colors['-衰减包络线'] = '#E57373'
+
+        # 直接传入 ndarray 字典，由 Streamlit 自行转换，无需在此构建 DataFrame；
+        # 颜色列表按 Vega-Lite 的图例顺序（曲线名升序）排列，而不是按插入顺序
+        st.line_chart(curves, x='Time (s)', color=[colors[name] for name in sorted(colors)])
 
         # 物理意义说明
         #st.markdown("""
@@ -0,0 +1,85 @@
+"""悬臂梁一阶固有频率与阻尼振动计算的核心函数（不依赖 Streamlit）"""
+import functools
+import math
+
+import numpy as np
+
+TWO_PI = 2.0 * math.pi
+
+
+def equation_scalar(x):
+    """悬臂梁特征方程：1 + cos(x) * cosh(x) = 0，其中 x = p*l（标量）"""
+    return 1 + math.cos(x) * math.cosh(x)
+
+
+def solve_beta(L, x0=1.875, tol=1e-14, maxit=8):
+    """求解特征方程第一个根，返回 p（单位：1/m）及该根处的残差"""
+    x, f = _solve_beta1_L(x0, tol, maxit)
+    return x / L, f
+
+
+@functools.lru_cache(maxsize=64)
+def _solve_beta1_L(x0, tol, maxit):
+    """牛顿迭代求解无量纲根 x = p*L；x 与 L 无关，同一组迭代参数只需求解一次"""
+    x = x0
+    for _ in range(maxit):
+        c, s = math.cos(x), math.sin(x)
+        ch, sh = math.cosh(x), math.sinh(x)
+        f = 1 + c * ch
+        fp = -s * ch + c * sh  # 解析导数 f'(x)
+        dx = f / fp
+        x -= dx
+        if abs(dx) < tol:
+            break
+    return x, equation_scalar(x)
+
+
+def calculate_first_frequency(p, L, E, I, rho, A):
+    """计算悬臂梁一阶固有频率（无阻尼固有频率ωₙ）"""
+    stiffness_mass_ratio = math.sqrt((E * I) / (rho * A))
+    frequency = (p ** 2) * stiffness_mass_ratio / TWO_PI
+    return frequency
+
+
+def damped(t, A, zeta, wn, phi=0):
+    """阻尼振动位移、包络线及阻尼圆频率：x(t)=A·e^(-ζωₙt)·cos(ω_d t + φ)，原地运算避免中间数组
+
+    zeta 可为标量或一维数组；传入 K 个阻尼比时一次广播得到 (K, N) 的曲线族及 (K,) 的 ω_d，便于参数扫描
+    """
+    z = np.asarray(zeta, dtype=float)[..., None]
+    # 欠阻尼时 ω_d>0 产生振动；临界阻尼或过阻尼时 ω_d=0，退化为指数衰减
+    wd = wn * np.sqrt(np.clip(1 - z ** 2, 0, None))
+    env = np.multiply(-z * wn, t)
+    np.exp(env, out=env)
+    env *= A
+    out = np.multiply(wd, t)
+    out += phi
+    np.cos(out, out=out)
+    out *= env
+    return out, env, wd[..., 0]
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 降采样，返回保留点的下标（保留峰谷形状）"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    # 首尾两点之外的数据均分为 n_out-2 个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # 下一个桶的平均点（最后一个桶以末点代替）
+        if i + 2 < n_out - 1:
+            cx = x[stop:edges[i + 2]].mean()
+            cy = y[stop:edges[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        # 选取与上一个保留点、下一个桶平均点构成三角形面积最大的点
+        area = np.abs((x[a] - cx) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx